@@ -4,56 +4,96 @@ Kill Line: North America - Annual simulator prototype
 
 Usage:
   python annual_sim.py --years 25 --seed 42
+  python annual_sim.py --years 25 --seed 42 --batch 100000
+Requires:
+  numpy (pip install numpy), for both modes
 """
 from __future__ import annotations
 
 import argparse
 import random
+from bisect import bisect_left
+from itertools import accumulate
 from dataclasses import dataclass, field
-from enum import Enum
-
-
-class MacroCycle(str, Enum):
-    BOOM = "Boom"
-    TIGHTENING = "Tightening"
-    RECESSION = "Recession"
-
-
-MACRO_PARAMS = {
-    MacroCycle.BOOM: {
-        "income_mult": 1.08,
-        "asset_return": 0.11,
-        "risk_base": 0.08,
-    },
-    MacroCycle.TIGHTENING: {
-        "income_mult": 0.98,
-        "asset_return": 0.03,
-        "risk_base": 0.16,
-    },
-    MacroCycle.RECESSION: {
-        "income_mult": 0.85,
-        "asset_return": -0.10,
-        "risk_base": 0.30,
-    },
-}
+from enum import IntEnum
+
+import numpy as np
+
+
+class MacroCycle(IntEnum):
+    BOOM = 0
+    TIGHTENING = 1
+    RECESSION = 2
+
+    @property
+    def label(self) -> str:
+        return self.name.title()
 
-CYCLE_TRANSITION = {
-    MacroCycle.BOOM: [
+
+# (income_mult, asset_return, risk_base), one row per cycle, indexed by int(cycle).
+MACRO_PARAMS = (
+    (1.08, 0.11, 0.08),  # BOOM
+    (0.98, 0.03, 0.16),  # TIGHTENING
+    (0.85, -0.10, 0.30),  # RECESSION
+)
+
+# Next-cycle probabilities, indexed by int(cycle); the current cycle is listed first.
+CYCLE_TRANSITION = (
+    (
         (MacroCycle.BOOM, 0.62),
         (MacroCycle.TIGHTENING, 0.33),
         (MacroCycle.RECESSION, 0.05),
-    ],
-    MacroCycle.TIGHTENING: [
+    ),
+    (
         (MacroCycle.TIGHTENING, 0.48),
         (MacroCycle.BOOM, 0.20),
         (MacroCycle.RECESSION, 0.32),
-    ],
-    MacroCycle.RECESSION: [
+    ),
+    (
         (MacroCycle.RECESSION, 0.56),
         (MacroCycle.TIGHTENING, 0.31),
         (MacroCycle.BOOM, 0.13),
-    ],
+    ),
+)
+
+# Per-cycle (cumulative probabilities, next cycles) for choose_next_cycle, indexed by int(cycle).
+CYCLE_CDF = tuple(
+    (tuple(accumulate(p for _, p in trans)), tuple(nc for nc, _ in trans)) for trans in CYCLE_TRANSITION
+)
+
+# Dense tables for the batched path; row/column i is MacroCycle(i).
+CYCLES = list(MacroCycle)
+CYCLE_INCOME_MULT, CYCLE_ASSET_RETURN, CYCLE_RISK_BASE = np.array(MACRO_PARAMS).T.copy()
+CYCLE_CUM_TRANSITION = np.cumsum(
+    [[dict(CYCLE_TRANSITION[a]).get(b, 0.0) for b in CYCLES] for a in CYCLES], axis=1
+)
+
+# Risk event effects for the batched path, indexed like risk_check's event list;
+# the extra last row is "no event" and leaves every value unchanged.
+RISK_EVENTS = ["Layoff", "Medical Shock", "Market Crash", "Startup Failure"]
+RISK_CASH = np.array([-12000.0, -18000.0, 0.0, -22000.0, 0.0])
+RISK_INCOME_MULT = np.array([0.86, 1.0, 1.0, 0.90, 1.0])
+RISK_MENTAL = np.array([-8.0, -12.0, -9.0, 0.0, 0.0])
+RISK_STABILITY = np.array([0.0, -4.0, 0.0, -7.0, 0.0])
+RISK_CAREER_ADD = np.array([0.08, 0.0, 0.0, 0.12, 0.0])
+RISK_CAREER_CAP = np.array([0.95, np.inf, np.inf, 0.98, np.inf])
+RISK_TECH_MULT = np.array([1.0, 1.0, 0.83, 1.0, 1.0])
+RISK_LEV_MULT = np.array([1.0, 1.0, 0.70, 1.0, 1.0])
+
+# Row layout of the (6, m) portfolio matrix used by run_batch; each field is one contiguous row.
+FIELDS = {
+    "index_funds": 0,
+    "tech_stocks": 1,
+    "leveraged_etf": 2,
+    "passive_income_assets": 3,
+    "real_estate": 4,
+    "debt": 5,
 }
+INDEX, TECH, LEV, PASSIVE, HOUSE, DEBT = range(len(FIELDS))
+# Per-row coefficients of annual_asset_change: delta = p * (ret * RETURN + shock * SHOCK + DRIFT).
+ASSET_RETURN_COEF = np.array([0.75, 1.25, 2.0, 0.0, 0.55, 0.0])[:, None]
+ASSET_SHOCK_COEF = np.array([0.35, 0.75, 1.25, 0.12, 0.22, 0.0])[:, None]
+ASSET_DRIFT_COEF = np.array([0.0, 0.0, 0.0, 0.04, 0.0, 0.0])[:, None]
 
 
 @dataclass
@@ -95,33 +135,55 @@ class YearResult:
     cash: float
 
 
+@dataclass
+class BatchResult:
+    """Per-lifetime outcomes of AnnualSimulator.run_batch, frozen at the year of failure."""
+
+    years_survived: np.ndarray
+    failed: np.ndarray
+    win: np.ndarray
+    cash: np.ndarray
+    net_worth: np.ndarray
+    mental: np.ndarray
+    stability: np.ndarray
+    max_drawdown: np.ndarray
+    avg_risk: np.ndarray
+
+
 class AnnualSimulator:
     def __init__(self, seed: int = 42):
+        self.seed = seed
         self.rng = random.Random(seed)
         self.state = PlayerState()
         self.current_cycle = MacroCycle.BOOM
 
     def choose_next_cycle(self) -> MacroCycle:
-        transitions = CYCLE_TRANSITION[self.current_cycle]
-        r = self.rng.random()
-        acc = 0.0
-        for cycle, prob in transitions:
-            acc += prob
-            if r <= acc:
-                return cycle
-        return transitions[-1][0]
-
-    def volatility(self) -> float:
+        cdf, nexts = CYCLE_CDF[self.current_cycle]
+        return nexts[min(bisect_left(cdf, self.rng.random()), len(nexts) - 1)]
+
+    def invest_total(self) -> float:
+        p = self.state.portfolio
+        return p.index_funds + p.tech_stocks + p.leveraged_etf + p.passive_income_assets
+
+    def volatility(self, invest_total: float | None = None) -> float:
         p = self.state.portfolio
-        invest_total = max(1.0, p.index_funds + p.tech_stocks + p.leveraged_etf + p.passive_income_assets)
+        if invest_total is None:
+            invest_total = self.invest_total()
+        invest_total = max(1.0, invest_total)
         weighted_invest_risk = (
             p.index_funds * 0.12 + p.tech_stocks * 0.22 + p.leveraged_etf * 0.45 + p.passive_income_assets * 0.08
         ) / invest_total
         return min(0.95, weighted_invest_risk + self.state.career_risk * 0.45)
 
-    def fragility(self, annual_expenses: float) -> float:
+    def fragility(
+        self, annual_expenses: float, assets_total: float | None = None, invest_total: float | None = None
+    ) -> float:
         p = self.state.portfolio
-        assets_total = max(1.0, p.index_funds + p.tech_stocks + p.leveraged_etf + p.passive_income_assets + p.real_estate)
+        if assets_total is None:
+            if invest_total is None:
+                invest_total = self.invest_total()
+            assets_total = invest_total + p.real_estate
+        assets_total = max(1.0, assets_total)
         leverage_ratio = max(0.0, p.debt / assets_total)
         high_vol_ratio = (p.tech_stocks + p.leveraged_etf) / max(1.0, p.index_funds + p.tech_stocks + p.leveraged_etf)
 
@@ -146,12 +208,10 @@ class AnnualSimulator:
         debt_cost = p.debt * 0.09
         return base_living + mortgage + health + education + debt_cost
 
-    def annual_asset_change(self, cycle: MacroCycle, vol: float) -> float:
+    def annual_asset_change(self, base_return: float, vol: float) -> float:
         p = self.state.portfolio
-        params = MACRO_PARAMS[cycle]
 
         market_shock = self.rng.uniform(-1.0, 1.0) * vol
-        base_return = params["asset_return"]
 
         index_delta = p.index_funds * (base_return * 0.75 + market_shock * 0.35)
         tech_delta = p.tech_stocks * (base_return * 1.25 + market_shock * 0.75)
@@ -173,10 +233,9 @@ class AnnualSimulator:
 
         return index_delta + tech_delta + lev_delta + passive_delta + house_delta
 
-    def risk_check(self, cycle: MacroCycle, fragility: float) -> str | None:
-        params = MACRO_PARAMS[cycle]
+    def risk_check(self, risk_base: float, fragility: float) -> str | None:
         mental_multiplier = 1.0 + max(0.0, (55.0 - self.state.mental) / 120.0)
-        risk_rate = params["risk_base"] * fragility * mental_multiplier
+        risk_rate = risk_base * fragility * mental_multiplier
         if fragility > 0.85:
             risk_rate *= 2.0
 
@@ -208,23 +267,25 @@ class AnnualSimulator:
 
     def net_worth(self) -> float:
         p = self.state.portfolio
-        assets = p.index_funds + p.tech_stocks + p.leveraged_etf + p.passive_income_assets + p.real_estate
-        return assets + self.state.cash - p.debt
+        return self.invest_total() + p.real_estate + self.state.cash - p.debt
 
     def run_year(self, year: int) -> YearResult:
         self.current_cycle = self.choose_next_cycle()
+        income_mult, asset_return, risk_base = MACRO_PARAMS[self.current_cycle]
         annual_expenses = self.annual_expenses()
-        vol = self.volatility()
-        frag = self.fragility(annual_expenses)
+        invest_total = self.invest_total()
+        assets_total = invest_total + self.state.portfolio.real_estate
+        vol = self.volatility(invest_total)
+        frag = self.fragility(annual_expenses, assets_total=assets_total)
 
-        yearly_income = self.state.income_power * MACRO_PARAMS[self.current_cycle]["income_mult"]
+        yearly_income = self.state.income_power * income_mult
         yearly_income += self.state.portfolio.passive_income_assets * 0.12
         self.state.cash += yearly_income
 
         self.state.cash -= annual_expenses
-        asset_delta = self.annual_asset_change(self.current_cycle, vol)
+        asset_delta = self.annual_asset_change(asset_return, vol)
 
-        risk_event = self.risk_check(self.current_cycle, frag)
+        risk_event = self.risk_check(risk_base, frag)
 
         if self.state.cash < 0:
             self.state.bankrupt_streak += 1
@@ -258,6 +319,140 @@ class AnnualSimulator:
     def is_failed(self) -> bool:
         return self.state.bankrupt_streak >= 2
 
+    def run_batch(self, m: int, years: int) -> BatchResult:
+        """Simulate m independent lifetimes at once, one vectorized pass per year.
+
+        Mirrors run_year step for step on (m,) arrays. Draws come from a NumPy
+        generator seeded with self.seed, so individual lifetimes do not replay
+        the scalar path, but the distribution is the same. Every lifetime starts
+        like a new simulator, from a default PlayerState in MacroCycle.BOOM;
+        self.state and self.current_cycle are neither read nor changed.
+        """
+        rng = np.random.default_rng(self.seed)
+        start = PlayerState()
+        sp = start.portfolio
+
+        cash = np.full(m, start.cash, dtype=np.float64)
+        income_power = np.full(m, start.income_power, dtype=np.float64)
+        mental = np.full(m, start.mental, dtype=np.float64)
+        stability = np.full(m, start.stability, dtype=np.float64)
+        career_risk = np.full(m, start.career_risk, dtype=np.float64)
+        p = np.empty((len(FIELDS), m), dtype=np.float64)
+        for name, row in FIELDS.items():
+            p[row] = getattr(sp, name)
+        cycle_idx = np.full(m, int(MacroCycle.BOOM))
+
+        bankrupt_streak = np.zeros(m, dtype=np.int64)
+        peak_net_worth = np.zeros(m)
+        max_drawdown = np.zeros(m)
+        risk_exposure_sum = np.zeros(m)
+
+        alive = np.ones(m, dtype=bool)
+        years_survived = np.full(m, years)
+        final = {
+            "cash": cash.copy(),
+            "net_worth": p[:DEBT].sum(0) + cash - p[DEBT],
+            "mental": mental.copy(),
+            "stability": stability.copy(),
+            "max_drawdown": np.zeros(m),
+            "risk_exposure_sum": np.zeros(m),
+        }
+
+        for y in range(1, years + 1):
+            # every random number this year in one call; the symmetric noise rows are rescaled from [0, 1)
+            u_cycle, u_shock, u_risk, u_event, u_mental, u_stability = rng.random((6, m))
+            cycle_idx = np.minimum((u_cycle[:, None] > CYCLE_CUM_TRANSITION[cycle_idx]).sum(1), len(CYCLES) - 1)
+
+            annual_expenses = 38000.0 + p[HOUSE] * 0.045 + 7000.0 + 2500.0 + p[DEBT] * 0.09
+
+            invest_total = np.maximum(1.0, p[INDEX] + p[TECH] + p[LEV] + p[PASSIVE])
+            weighted_invest_risk = (
+                p[INDEX] * 0.12 + p[TECH] * 0.22 + p[LEV] * 0.45 + p[PASSIVE] * 0.08
+            ) / invest_total
+            vol = np.minimum(0.95, weighted_invest_risk + career_risk * 0.45)
+
+            assets_total = np.maximum(1.0, invest_total + p[HOUSE])
+            leverage_ratio = np.maximum(0.0, p[DEBT] / assets_total)
+            high_vol_ratio = (p[TECH] + p[LEV]) / np.maximum(1.0, p[INDEX] + p[TECH] + p[LEV])
+            net_income = np.maximum(1.0, income_power + p[PASSIVE] * 0.12)
+            cashflow_pressure = np.maximum(0.0, (annual_expenses - net_income) / annual_expenses)
+            frag = np.clip(
+                leverage_ratio * 0.4 + high_vol_ratio * 0.3 + cashflow_pressure * 0.2 + career_risk * 0.1,
+                0.0,
+                1.5,
+            )
+
+            cash += income_power * CYCLE_INCOME_MULT[cycle_idx] + p[PASSIVE] * 0.12
+            cash -= annual_expenses
+
+            market_shock = (2.0 * u_shock - 1.0) * vol
+            base_return = CYCLE_ASSET_RETURN[cycle_idx]
+            p += p * (base_return * ASSET_RETURN_COEF + market_shock * ASSET_SHOCK_COEF + ASSET_DRIFT_COEF)
+            np.maximum(p, 0.0, out=p)
+
+            mental_multiplier = 1.0 + np.maximum(0.0, (55.0 - mental) / 120.0)
+            risk_rate = CYCLE_RISK_BASE[cycle_idx] * frag * mental_multiplier
+            risk_rate = np.where(frag > 0.85, risk_rate * 2.0, risk_rate)
+            mask = u_risk <= risk_rate
+            event_idx = np.where(mask, (u_event * len(RISK_EVENTS)).astype(np.int64), len(RISK_EVENTS))
+            cash += RISK_CASH[event_idx]
+            income_power *= RISK_INCOME_MULT[event_idx]
+            mental += RISK_MENTAL[event_idx]
+            stability += RISK_STABILITY[event_idx]
+            career_risk = np.minimum(RISK_CAREER_CAP[event_idx], career_risk + RISK_CAREER_ADD[event_idx])
+            p[TECH] *= RISK_TECH_MULT[event_idx]
+            p[LEV] *= RISK_LEV_MULT[event_idx]
+
+            bankrupt_streak = np.where(cash < 0, bankrupt_streak + 1, 0)
+
+            mental = np.clip(mental + (2.0 * u_mental - 1.0) * 2.5, 0.0, 100.0)
+            stability = np.clip(stability + (2.0 * u_stability - 1.0) * 1.8, 0.0, 100.0)
+
+            nw = p[:DEBT].sum(0) + cash - p[DEBT]
+            np.maximum(peak_net_worth, nw, out=peak_net_worth)
+            positive_peak = peak_net_worth > 0
+            dd = np.divide(peak_net_worth - nw, peak_net_worth, out=np.zeros(m), where=positive_peak)
+            np.maximum(max_drawdown, dd, out=max_drawdown)
+
+            risk_exposure_sum += frag
+
+            for name, arr in (
+                ("cash", cash),
+                ("net_worth", nw),
+                ("mental", mental),
+                ("stability", stability),
+                ("max_drawdown", max_drawdown),
+                ("risk_exposure_sum", risk_exposure_sum),
+            ):
+                np.copyto(final[name], arr, where=alive)
+
+            failed_now = alive & (bankrupt_streak >= 2)
+            years_survived[failed_now] = y
+            alive &= ~failed_now
+            if not alive.any():
+                break
+
+        avg_risk = np.minimum(1.5, final["risk_exposure_sum"] / np.maximum(1, years_survived))
+        safe_dims = (
+            (final["cash"] > 8000).astype(np.int64)
+            + (final["net_worth"] > 120000)
+            + (final["mental"] > 45)
+            + (final["stability"] > 45)
+        )
+        win = (years_survived >= 25) & (safe_dims >= 2) & (avg_risk < 0.75)
+
+        return BatchResult(
+            years_survived=years_survived,
+            failed=~alive,
+            win=win,
+            cash=final["cash"],
+            net_worth=final["net_worth"],
+            mental=final["mental"],
+            stability=final["stability"],
+            max_drawdown=final["max_drawdown"],
+            avg_risk=avg_risk,
+        )
+
 
 def grade_endgame(sim: AnnualSimulator, years_survived: int) -> tuple[bool, str]:
     s = sim.state
@@ -288,9 +483,21 @@ def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--years", type=int, default=25)
     parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch", type=int, default=0, help="simulate this many lifetimes and print aggregates")
     args = parser.parse_args()
 
     sim = AnnualSimulator(seed=args.seed)
+    if args.batch > 0:
+        batch = sim.run_batch(args.batch, args.years)
+        print(f"=== BATCH ({args.batch} lifetimes, {args.years} years) ===")
+        print(f"Win rate: {batch.win.mean():.2%}")
+        print(f"Bankrupt: {batch.failed.mean():.2%}")
+        print(f"Avg survived years: {batch.years_survived.mean():.2f}")
+        nw_pcts = np.percentile(batch.net_worth, [10, 50, 90])
+        print("Net worth p10/p50/p90: " + "/".join(f"{v:,.0f}" for v in nw_pcts))
+        print(f"Avg max drawdown: {batch.max_drawdown.mean():.2%}")
+        return
+
     results: list[YearResult] = []
 
     for y in range(1, args.years + 1):
@@ -298,7 +505,7 @@ def main() -> None:
         results.append(res)
         event_txt = res.risk_triggered if res.risk_triggered else "-"
         print(
-            f"Y{y:02d} {res.cycle.value:<10} "
+            f"Y{y:02d} {res.cycle.label:<10} "
             f"income={res.income:>10.0f} exp={res.expenses:>9.0f} "
             f"assetΔ={res.asset_delta:>9.0f} frag={res.fragility:.3f} "
             f"cash={res.cash:>10.0f} nw={res.net_worth:>11.0f} risk={event_txt}"
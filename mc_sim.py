@@ -2,25 +2,46 @@
 """
 北美斩杀线模拟器 v2.0 - Monte Carlo runner
 Usage:
-  python mc_sim.py --runs 2000 --seed 99000
+  python mc_sim.py --runs 2000 --seed 99000 [--num-workers 8]
 Outputs:
   summary in stdout + event_trigger_report.csv in current folder
+Requires:
+  numpy (pip install numpy)
 """
-import json, math, random, argparse, csv
-from collections import Counter, defaultdict
+import json, math, argparse, csv, os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from bisect import bisect_left
+
+import numpy as np
 
 TAGS = ['job', 'debt', 'housing', 'health', 'social', 'admin', 'car', 'money']
+TAG_IDX = {t: i for i, t in enumerate(TAGS)}
+
+# stats live in a 5-entry list in this order; all but money are clamped to [0, 100] and kept whole
+STATS = ['money', 'health', 'stress', 'family', 'friendship']
+STAT_IDX = {k: i for i, k in enumerate(STATS)}
+MONEY, HEALTH, STRESS, FAMILY, FRIENDSHIP = range(len(STATS))
+GAIN_STATS = (HEALTH, FAMILY, FRIENDSHIP)
+CLAMPED_STATS = (HEALTH, STRESS, FAMILY, FRIENDSHIP)
+
+STATE_TAG_MULT = {'S_LAYOFF': {'job': 1.6, 'debt': 1.35, 'money': 0.9, 'social': 0.95}, 'S_RENT_ARREARS': {'housing': 1.7, 'debt': 1.25, 'job': 1.1}, 'S_HIGH_INTEREST_LOAN': {'debt': 1.55, 'money': 0.85}, 'S_CREDIT_CARD_DEBT': {'debt': 1.25, 'money': 0.92}, 'S_INJURED': {'health': 1.55, 'job': 0.95}, 'S_HEALTH_SCARE': {'health': 1.35, 'admin': 1.1}, 'S_IMMIGRATION_ISSUE': {'admin': 1.55, 'job': 1.1}, 'S_CAR_BROKEN': {'car': 1.8, 'job': 1.05}, 'S_SOCIAL_ISOLATION': {'social': 1.45, 'health': 1.1}, 'S_WINDFALL_BUFFER': {'debt': 0.88, 'housing': 0.92, 'money': 1.12}, 'S_RENT_DUE': {'housing': 2.2}, 'S_TAX_DUE': {'admin': 2.0}, 'S_TRAFFIC_TICKET': {'car': 1.6, 'admin': 1.15}, 'S_COLLECTIONS_NOTICE': {'debt': 1.4, 'admin': 1.2}}
 
-def clamp(v, lo, hi): 
+def clamp(v, lo, hi):
     return max(lo, min(hi, v))
 
-def effective_gain(base_gain, stat_value, cfg):
-    if base_gain <= 0:
-        return base_gain
+def build_gain_decay(cfg):
+    """Recovery multiplier exp(-alpha * max(0, floor - stat)) for every whole stat value 0..100."""
     alpha = cfg["recovery"]["alpha"]
     floor = cfg["recovery"]["soft_floor"]
-    penalty = max(0, floor - stat_value)
-    return base_gain * math.exp(-alpha * penalty)
+    return [math.exp(-alpha * max(0, floor - stat)) for stat in range(101)]
+
+def effective_gain(base_gain, stat_value, tables):
+    if base_gain <= 0:
+        return base_gain
+    # simulate_one and apply_effects keep clamped stats whole numbers in [0, 100], so the lookup is exact
+    return base_gain * tables["gain_decay"][int(stat_value)]
 
 def cost_factor(month, cfg):
     infl = cfg["economy"].get("inflation_per_year", 0.0)
@@ -30,244 +51,311 @@ def wage_factor(month, cfg):
     wg = cfg["economy"].get("wage_growth_per_year", 0.0)
     return (1.0 + wg) ** (month / 12.0)
 
-def apply_effects(stats, effects):
+def effect_vector(effects):
+    delta = [0] * len(STATS)
     for k, dv in effects.items():
-        if k not in stats:
-            continue
-        stats[k] += dv
-        if k in ["health","stress","family","friendship"]:
-            stats[k] = int(round(clamp(stats[k], 0, 100)))
-
-def add_state(active, sdef):
-    sid = sdef["id"]
-    if sdef["type"] == "counter":
-        active.setdefault(sid, {"remaining": None})
-        return
-    if sdef.get("duration") is None:
-        active.setdefault(sid, {"remaining": None})
+        if k in STAT_IDX:
+            delta[STAT_IDX[k]] = dv
+    return delta
+
+def apply_effects(stats, delta):
+    stats[MONEY] += delta[MONEY]
+    for k in CLAMPED_STATS:
+        stats[k] = int(round(clamp(stats[k] + delta[k], 0, 100)))
+
+def state_duration(sdef):
+    # -1 marks states that never expire on their own (counters and open-ended states)
+    if sdef["type"] == "counter" or sdef.get("duration") is None:
+        return -1
+    return int(sdef.get("duration", 1))
+
+def add_state(active, remaining, i, tables):
+    dur = tables["state_duration"][i]
+    if dur < 0:
+        active[i] = True
         return
-    dur = int(sdef.get("duration", 1))
-    if sid in active:
-        behavior = sdef.get("stacking","refresh")
-        if behavior == "extend" and active[sid]["remaining"] is not None:
-            active[sid]["remaining"] += dur
-        else:
-            active[sid]["remaining"] = dur
+    if active[i] and tables["state_extend"][i]:
+        remaining[i] += dur
     else:
-        active[sid] = {"remaining": dur}
+        remaining[i] = dur
+    active[i] = True
 
-def remove_state(active, sid):
-    active.pop(sid, None)
+def remove_state(active, remaining, i):
+    active[i] = False
+    remaining[i] = -1
 
-def monthly_passive(stats, cfg):
+def passive_delta(stats, cfg, tables):
     mp = cfg["recovery"]["monthly_passive"]
-    base_h = mp["health_base_regen"] * (1.0 - stats["stress"]/140.0)
-    dh = effective_gain(base_h, stats["health"], cfg)
-    base_s = mp["stress_base_decay"] * (0.6 + stats["health"]/140.0 + stats["friendship"]/250.0)
+    _, health, stress, family, friendship = stats
+    base_h = mp["health_base_regen"] * (1.0 - stress/140.0)
+    dh = effective_gain(base_h, health, tables)
+    base_s = mp["stress_base_decay"] * (0.6 + health/140.0 + friendship/250.0)
     ds = -base_s
-    base_r = mp["relationship_base_regen"] * (1.0 - stats["stress"]/140.0)
-    dr = effective_gain(base_r, stats["family"], cfg)
-    df = effective_gain(base_r, stats["friendship"], cfg)
-    apply_effects(stats, {"health": int(round(dh)), "stress": int(round(ds)),
-                          "family": int(round(dr)), "friendship": int(round(df))})
-
-def tag_weights(active_states, state_tag_mult):
-    w = {t: 1.0 for t in TAGS}
-    for sid in active_states.keys():
-        mods = state_tag_mult.get(sid)
-        if not mods:
+    base_r = mp["relationship_base_regen"] * (1.0 - stress/140.0)
+    dr = effective_gain(base_r, family, tables)
+    df = effective_gain(base_r, friendship, tables)
+    return [0, round(dh), round(ds), round(dr), round(df)]
+
+def build_tag_mult(state_to_int):
+    mult = np.ones((len(state_to_int), len(TAGS)), np.float64)
+    for sid, mods in STATE_TAG_MULT.items():
+        if sid not in state_to_int:
             continue
-        for t, mult in mods.items():
-            if t in w:
-                w[t] *= mult
-    for t in w:
-        w[t] = clamp(w[t], 0.75, 1.55)
-    return w
-
-def weighted_choice(items, weights):
-    total = sum(weights)
-    r = random.random() * total
-    acc = 0.0
-    for it, w in zip(items, weights):
-        acc += w
-        if r <= acc:
-            return it
-    return items[-1]
-
-def build_pools(events):
-    pools = defaultdict(list)
-    for ev in events:
-        pools[ev["primary_tag"]].append(ev)
-    return dict(pools)
+        for t, m in mods.items():
+            if t in TAG_IDX:
+                mult[state_to_int[sid], TAG_IDX[t]] = m
+    return mult
+
+def tag_weights(active, tag_mult):
+    return np.minimum(np.maximum(tag_mult[active].prod(axis=0), 0.75), 1.55)
 
-def draw_event(pools, active_states, seen_counts, recent_list, cfg, state_tag_mult):
-    tw = tag_weights(active_states, state_tag_mult)
-    tag = weighted_choice(list(tw.keys()), list(tw.values()))
+def weighted_choice(weights, r):
+    """Index into the weights list drawn proportionally to them; r is a uniform draw in [0, 1)."""
+    cw = list(accumulate(weights))
+    return min(bisect_left(cw, r * cw[-1]), len(cw) - 1)
+
+def build_pools(events, id_to_int):
+    by_tag = defaultdict(list)
+    for ev in events:
+        by_tag[ev["primary_tag"]].append(ev)
+    pools = {}
+    for tag, evs in by_tag.items():
+        pools[tag] = {
+            "ids": [id_to_int[e["id"]] for e in evs],
+            "base": [e.get("base_weight", 1.0) for e in evs],
+        }
+    return pools
+
+def draw_event(pools, active, seen_counts, recent_hits, cfg, tag_mult, r_tag, r_event):
+    """Returns the int id of the drawn event."""
+    tag = TAGS[weighted_choice(tag_weights(active, tag_mult).tolist(), r_tag)]
     pool = pools[tag]
+    ids = pool["ids"]
 
     beta = cfg["draw"]["anti_repeat_beta"]
-    recent_window = cfg["draw"]["recent_window"]
     recent_penalty = cfg["draw"]["recent_penalty"]
 
-    weights = []
-    candidates = []
-    recent_set = set(recent_list[-recent_window:]) if recent_window > 0 else set()
-    for ev in pool:
-        sid = ev["id"]
-        seen = seen_counts.get(sid, 0)
-        w = ev.get("base_weight", 1.0) / ((1.0 + seen) ** beta)
-        if sid in recent_set:
-            w *= recent_penalty
-        candidates.append(ev)
-        weights.append(w)
-
-    return weighted_choice(candidates, weights)
-
-def apply_choice(stats, ch, active, counters, cfg, month, state_index):
-    eff = dict(ch.get("effects", {}))
-    cf = cost_factor(month, cfg)
-    wf = wage_factor(month, cfg)
+    w = [b / (1.0 + seen_counts[i]) ** beta * (recent_penalty if recent_hits[i] else 1.0)
+         for i, b in zip(ids, pool["base"])]
+    return ids[weighted_choice(w, r_event)]
+
+def compile_choice(ch, state_to_int):
+    return {
+        "delta": effect_vector(ch.get("effects", {})),
+        "pay_rent": ch.get("action") == "PAY_RENT",
+        "add_states": [state_to_int[sid] for sid in ch.get("add_states", [])],
+        "remove_states": [state_to_int[sid] for sid in ch.get("remove_states", [])],
+    }
+
+def apply_choice(stats, ch, active, remaining, counters, cfg, cf, wf, tables):
+    eff = ch["delta"].copy()
 
     # PAY_RENT action => charge current rent dynamically
-    if ch.get("action") == "PAY_RENT":
+    if ch["pay_rent"]:
         rent = int(round(cfg["economy"]["rent"] * cf))
-        eff["money"] = eff.get("money", 0) - rent
-
-    for k in ["health","family","friendship"]:
-        if k in eff and eff[k] > 0:
-            eff[k] = int(round(effective_gain(eff[k], stats[k], cfg)))
-
-    if "money" in eff:
-        m = eff["money"]
-        if m > 0:
-            m = m * cfg["balance"]["pos_money_mult"] * wf
-            if "S_HIGH_INTEREST_LOAN" in active:
-                m *= 0.85
-        else:
-            m = m * cfg["balance"]["neg_money_mult"] * cf
-        eff["money"] = int(round(m))
+        eff[MONEY] -= rent
 
-    if "stress" in eff:
-        eff["stress"] = int(round(eff["stress"] * cfg["balance"]["stress_mult"]))
+    for k in GAIN_STATS:
+        if eff[k] > 0:
+            eff[k] = int(round(effective_gain(eff[k], stats[k], tables)))
+
+    m = eff[MONEY]
+    if m > 0:
+        m = m * cfg["balance"]["pos_money_mult"] * wf
+        if active[tables["idx_loan"]]:
+            m *= 0.85
+    else:
+        m = m * cfg["balance"]["neg_money_mult"] * cf
+    eff[MONEY] = int(round(m))
+
+    eff[STRESS] = int(round(eff[STRESS] * cfg["balance"]["stress_mult"]))
 
     apply_effects(stats, eff)
 
-    for sid in ch.get("add_states", []):
-        add_state(active, state_index[sid])
-    for sid in ch.get("remove_states", []):
-        remove_state(active, sid)
-        if sid == "S_RENT_ARREARS":
+    for i in ch["add_states"]:
+        add_state(active, remaining, i, tables)
+    for i in ch["remove_states"]:
+        remove_state(active, remaining, i)
+        if i == tables["idx_arrears"]:
             counters["rent_arrears_months"] = 0
 
-def apply_state_monthly(stats, active_states, counters, cfg, month, state_index):
-    cf = cost_factor(month, cfg)
-    wf = wage_factor(month, cfg)
-    for sid in list(active_states.keys()):
-        sdef = state_index[sid]
+def compile_state_monthly(sdef):
+    """Compile a state's monthly effect into a per-stat list, its recovery-scaled stats and an income flag."""
+    vals = effect_vector(sdef.get("monthly_effect", {}))
+    # None marks a state with no monthly effect so apply_monthly can skip it
+    if not any(vals):
+        return None, (), False
+    return vals, tuple(k for k in GAIN_STATS if vals[k] > 0), vals[MONEY] > 0
+
+def apply_monthly(stats, active, remaining, counters, cfg, cf, wf, tables):
+    paycheck, layoff, loan, arrears = (tables[k] for k in ("idx_paycheck", "idx_layoff", "idx_loan", "idx_arrears"))
+    pos_mult = cfg["balance"]["pos_money_mult"]
+    neg_mult = cfg["balance"]["neg_money_mult"]
+    stress_mult = cfg["balance"]["stress_mult"]
+    # passive regen and every active state's monthly effect are scaled off the stats at the
+    # start of the month, summed into one delta and clamped once
+    delta = passive_delta(stats, cfg, tables)
+    for i in np.flatnonzero(active).tolist():
+        vals, gain_idx, money_pos = tables["state_monthly"][i]
 
         # If laid off, no paycheck
-        if sid == "S_PAYCHECK" and "S_LAYOFF" in active_states:
+        if i == paycheck and active[layoff]:
             pass
-        else:
-            eff = sdef.get("monthly_effect", {})
-            eff2 = {}
-            for k, v in eff.items():
-                if k in ["health","family","friendship"] and v > 0:
-                    eff2[k] = int(round(effective_gain(v, stats[k], cfg)))
-                elif k == "money" and v > 0 and "S_HIGH_INTEREST_LOAN" in active_states:
-                    eff2[k] = int(round(v * 0.85))
-                else:
-                    eff2[k] = v
-
-            if "money" in eff2:
-                m = eff2["money"]
-                if m > 0:
-                    eff2["money"] = int(round(m * cfg["balance"]["pos_money_mult"] * wf))
-                else:
-                    eff2["money"] = int(round(m * cfg["balance"]["neg_money_mult"] * cf))
-            if "stress" in eff2:
-                eff2["stress"] = int(round(eff2["stress"] * cfg["balance"]["stress_mult"]))
-            apply_effects(stats, eff2)
-
-        if sdef["type"] == "counter":
-            if sid == "S_RENT_ARREARS":
+        elif vals is not None:
+            eff = vals.copy()
+            for k in gain_idx:
+                eff[k] = round(effective_gain(vals[k], stats[k], tables))
+            m = eff[MONEY]
+            if money_pos:
+                if active[loan]:
+                    m = round(m * 0.85)
+                eff[MONEY] = round(m * pos_mult * wf)
+            else:
+                eff[MONEY] = round(m * neg_mult * cf)
+            eff[STRESS] = round(eff[STRESS] * stress_mult)
+            delta = [d + e for d, e in zip(delta, eff)]
+
+        if tables["state_counter"][i]:
+            if i == arrears:
                 counters["rent_arrears_months"] = counters.get("rent_arrears_months", 0) + 1
             continue
 
-        rem = active_states[sid].get("remaining", None)
-        if rem is not None:
-            rem -= 1
-            if rem <= 0:
-                del active_states[sid]
-            else:
-                active_states[sid]["remaining"] = rem
-
-def month_end_rent(stats, active, counters, cfg, month, state_index):
-    rent = int(round(cfg["economy"]["rent"] * cost_factor(month, cfg)))
-    if "S_RENT_DUE" in active:
-        if stats["money"] >= rent:
-            apply_effects(stats, {"money": -rent, "stress": -1})
-            remove_state(active, "S_RENT_DUE")
+        if remaining[i] >= 0:
+            remaining[i] -= 1
+            if remaining[i] <= 0:
+                remove_state(active, remaining, i)
+
+    apply_effects(stats, delta)
+
+def month_end_rent(stats, active, remaining, counters, cfg, cf, tables):
+    rent_due = tables["idx_rent_due"]
+    rent = int(round(cfg["economy"]["rent"] * cf))
+    if active[rent_due]:
+        if stats[MONEY] >= rent:
+            apply_effects(stats, effect_vector({"money": -rent, "stress": -1}))
+            remove_state(active, remaining, rent_due)
         else:
-            remove_state(active, "S_RENT_DUE")
-            add_state(active, state_index["S_RENT_ARREARS"])
-    add_state(active, state_index["S_RENT_DUE"])
+            remove_state(active, remaining, rent_due)
+            add_state(active, remaining, tables["idx_arrears"], tables)
+    add_state(active, remaining, rent_due, tables)
 
-def fatal_strikes(stats, active_states, counters, cfg):
+def fatal_strikes(stats, active, counters, cfg, tables):
     strikes = 0
-    if stats["money"] < cfg["thresholds"]["money_hard"]:
+    if stats[MONEY] < cfg["thresholds"]["money_hard"]:
         strikes += 1
-    if "S_RENT_ARREARS" in active_states and counters.get("rent_arrears_months", 0) >= cfg["thresholds"]["eviction_months"]:
+    if active[tables["idx_arrears"]] and counters.get("rent_arrears_months", 0) >= cfg["thresholds"]["eviction_months"]:
         strikes += 1
-    if stats["health"] <= 0 or stats["stress"] >= 100 or stats["family"] <= 0 or stats["friendship"] <= 0:
+    if stats[HEALTH] <= 0 or stats[STRESS] >= 100 or stats[FAMILY] <= 0 or stats[FRIENDSHIP] <= 0:
         strikes += 1
     return strikes
 
-def simulate_one(events, states, cfg, seed):
-    random.seed(seed)
-    pools = build_pools(events)
-    state_index = {s["id"]: s for s in states}
-    state_tag_mult = {'S_LAYOFF': {'job': 1.6, 'debt': 1.35, 'money': 0.9, 'social': 0.95}, 'S_RENT_ARREARS': {'housing': 1.7, 'debt': 1.25, 'job': 1.1}, 'S_HIGH_INTEREST_LOAN': {'debt': 1.55, 'money': 0.85}, 'S_CREDIT_CARD_DEBT': {'debt': 1.25, 'money': 0.92}, 'S_INJURED': {'health': 1.55, 'job': 0.95}, 'S_HEALTH_SCARE': {'health': 1.35, 'admin': 1.1}, 'S_IMMIGRATION_ISSUE': {'admin': 1.55, 'job': 1.1}, 'S_CAR_BROKEN': {'car': 1.8, 'job': 1.05}, 'S_SOCIAL_ISOLATION': {'social': 1.45, 'health': 1.1}, 'S_WINDFALL_BUFFER': {'debt': 0.88, 'housing': 0.92, 'money': 1.12}, 'S_RENT_DUE': {'housing': 2.2}, 'S_TAX_DUE': {'admin': 2.0}, 'S_TRAFFIC_TICKET': {'car': 1.6, 'admin': 1.15}, 'S_COLLECTIONS_NOTICE': {'debt': 1.4, 'admin': 1.2}}
-
-    stats = {
-        "money": cfg["attrs"]["money"]["start"],
-        "health": cfg["attrs"]["health"]["start"],
-        "stress": cfg["attrs"]["stress"]["start"],
-        "family": cfg["attrs"]["family"]["start"],
-        "friendship": cfg["attrs"]["friendship"]["start"],
+def precompile(events, states, cfg):
+    """One-time flattening of the loaded JSON into lookup tables shared by every run."""
+    id_to_int = {e["id"]: i for i, e in enumerate(events)}
+    state_to_int = {s["id"]: i for i, s in enumerate(states)}
+    return {
+        "n_events": len(events),
+        "id_to_int": id_to_int,
+        "pools": build_pools(events, id_to_int),
+        # compiled choices per event id, same order as ev["choices"]
+        "choices": [[compile_choice(ch, state_to_int) for ch in ev["choices"]] for ev in events],
+        # states are referred to by their index in states.json from here on
+        "n_states": len(states),
+        "state_to_int": state_to_int,
+        "state_duration": [state_duration(s) for s in states],
+        "state_extend": [s.get("stacking", "refresh") == "extend" for s in states],
+        "state_counter": [s["type"] == "counter" for s in states],
+        "state_monthly": [compile_state_monthly(s) for s in states],
+        # states the run loop checks by name, resolved to their index once
+        "idx_paycheck": state_to_int["S_PAYCHECK"],
+        "idx_layoff": state_to_int["S_LAYOFF"],
+        "idx_loan": state_to_int["S_HIGH_INTEREST_LOAN"],
+        "idx_arrears": state_to_int["S_RENT_ARREARS"],
+        "idx_rent_due": state_to_int["S_RENT_DUE"],
+        # (n_states, n_tags) draw-weight multipliers, 1.0 where a state has no effect on a tag
+        "tag_mult": build_tag_mult(state_to_int),
+        "gain_decay": build_gain_decay(cfg),
     }
-    active = {}
-    counters = {"rent_arrears_months": 0}
-    seen_counts = {}
-    recent = []
-    event_counts = Counter()
-
-    add_state(active, state_index["S_RENT_DUE"])
-    add_state(active, state_index["S_PAYCHECK"])
 
+def run_result(ok, seen_counts):
+    """(survived, unique events seen, per-event counts as an int array for main() to sum)"""
+    counts = np.array(seen_counts, np.int32)
+    return ok, int(np.count_nonzero(counts)), counts
+
+def simulate_one(tables, cfg, seed):
+    rng = np.random.default_rng(seed)
+    pools = tables["pools"]
+    tag_mult = tables["tag_mult"]
+
+    stats = [cfg["attrs"][k]["start"] for k in STATS]
+    # bring the configured starts into range before month 0's passive regen reads them
+    apply_effects(stats, [0] * len(STATS))
+    # active[i]: state i is on; remaining[i]: months left, -1 when it does not expire
+    active = np.zeros(tables["n_states"], np.bool_)
+    remaining = np.full(tables["n_states"], -1, np.int32)
+    counters = {"rent_arrears_months": 0}
+    # per-event trigger counts for this run, indexed by event id; returned to main() as an array
+    seen_counts = [0] * tables["n_events"]
+    # ring buffer of the last recent_window draws; recent_hits[i] counts copies of event i in it
+    recent_window = min(cfg["draw"]["recent_window"], 40)
+    recent_ring = [-1] * recent_window
+    recent_hits = [0] * tables["n_events"]
+    write_idx = 0
+
+    add_state(active, remaining, tables["idx_rent_due"], tables)
+    add_state(active, remaining, tables["idx_paycheck"], tables)
+
+    # all uniforms for the run in one call: [month][turn] -> (tag pick, event pick, choice pick)
+    uniforms = rng.random((cfg["max_months"], cfg["turns_per_month"], 3)).tolist()
     for month in range(cfg["max_months"]):
-        monthly_passive(stats, cfg)
-        apply_state_monthly(stats, active, counters, cfg, month, state_index)
-
-        for _ in range(cfg["turns_per_month"]):
-            ev = draw_event(pools, active, seen_counts, recent, cfg, state_tag_mult)
-            event_counts[ev["id"]] += 1
-            seen_counts[ev["id"]] = seen_counts.get(ev["id"], 0) + 1
-            recent.append(ev["id"])
-            if len(recent) > 40:
-                recent = recent[-40:]
-
-            ch = random.choice(ev["choices"])
-            apply_choice(stats, ch, active, counters, cfg, month, state_index)
-
-            if fatal_strikes(stats, active, counters, cfg) >= cfg["thresholds"]["collections_strikes"]:
-                return False, len(seen_counts), event_counts
-
-        month_end_rent(stats, active, counters, cfg, month, state_index)
-        if fatal_strikes(stats, active, counters, cfg) >= cfg["thresholds"]["collections_strikes"]:
-            return False, len(seen_counts), event_counts
-
-    return True, len(seen_counts), event_counts
+        cf = cost_factor(month, cfg)
+        wf = wage_factor(month, cfg)
+        apply_monthly(stats, active, remaining, counters, cfg, cf, wf, tables)
+
+        for r_tag, r_event, r_choice in uniforms[month]:
+            i = draw_event(pools, active, seen_counts, recent_hits, cfg, tag_mult, r_tag, r_event)
+            seen_counts[i] += 1
+            if recent_window > 0:
+                slot = write_idx % recent_window
+                if recent_ring[slot] >= 0:
+                    recent_hits[recent_ring[slot]] -= 1
+                recent_ring[slot] = i
+                recent_hits[i] += 1
+                write_idx += 1
+
+            choices = tables["choices"][i]
+            ch = choices[int(r_choice * len(choices))]
+            apply_choice(stats, ch, active, remaining, counters, cfg, cf, wf, tables)
+
+            if fatal_strikes(stats, active, counters, cfg, tables) >= cfg["thresholds"]["collections_strikes"]:
+                return run_result(False, seen_counts)
+
+        month_end_rent(stats, active, remaining, counters, cfg, cf, tables)
+        if fatal_strikes(stats, active, counters, cfg, tables) >= cfg["thresholds"]["collections_strikes"]:
+            return run_result(False, seen_counts)
+
+    return run_result(True, seen_counts)
+
+# per-process inputs for pool workers, set once by _init so only the seed is sent per task
+_TABLES = None
+_CFG = None
+
+def _init(tables, cfg):
+    global _TABLES, _CFG
+    _TABLES, _CFG = tables, cfg
+
+def _worker(seed):
+    return simulate_one(_TABLES, _CFG, seed)
+
+def run_seeds(tables, cfg, seeds, workers):
+    """Yields simulate_one's result for each seed in order, as the runs finish."""
+    if workers == 1:
+        _init(tables, cfg)
+        yield from map(_worker, seeds)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init,
+                             initargs=(tables, cfg)) as executor:
+        yield from executor.map(_worker, seeds, chunksize=max(1, len(seeds) // (4*workers)))
 
 def main():
     ap = argparse.ArgumentParser()
@@ -276,6 +364,7 @@ def main():
     ap.add_argument("--config", default="config.json")
     ap.add_argument("--runs", type=int, default=2000)
     ap.add_argument("--seed", type=int, default=99000)
+    ap.add_argument("--num-workers", type=int, default=os.cpu_count())
     args = ap.parse_args()
 
     with open(args.events, "r", encoding="utf-8") as f:
@@ -284,22 +373,30 @@ def main():
         states = json.load(f)["states"]
     with open(args.config, "r", encoding="utf-8") as f:
         cfg = json.load(f)["config"]
+    tables = precompile(events, states, cfg)
 
     wins = 0
     uniqs = []
-    total_counts = Counter()
-    for i in range(args.runs):
-        ok, uniq, ec = simulate_one(events, states, cfg, args.seed+i)
+    total_counts = np.zeros(len(events), np.int64)
+    seeds = range(args.seed, args.seed + args.runs)
+    workers = max(1, args.num_workers or 1)
+    # fold each run in as it arrives so the per-run count arrays are never all held at once
+    for ok, uniq, ec in run_seeds(tables, cfg, seeds, workers):
         wins += int(ok)
         uniqs.append(uniq)
-        total_counts.update(ec)
+        total_counts += ec
 
     win_rate = wins / args.runs
     uniq_ge_100 = sum(1 for u in uniqs if u >= 100) / args.runs
     uniq_avg = sum(uniqs)/args.runs
-    total_draws = sum(total_counts.values())
-    top10 = sum(c for _, c in total_counts.most_common(10)) / total_draws if total_draws else 0.0
-    top25 = sum(c for _, c in total_counts.most_common(25)) / total_draws if total_draws else 0.0
+    # one selection pass for all three percentiles, same ranks as sorted(uniqs)[int(p*runs)]
+    ranks = [int(0.10*args.runs), int(0.50*args.runs), int(0.90*args.runs)]
+    uniq_p10, uniq_p50, uniq_p90 = (int(u) for u in np.partition(np.asarray(uniqs), ranks)[ranks])
+    order = np.argsort(-total_counts, kind="stable")
+    ranked = total_counts[order]
+    total_draws = int(ranked.sum())
+    top10 = int(ranked[:10].sum()) / total_draws if total_draws else 0.0
+    top25 = int(ranked[:25].sum()) / total_draws if total_draws else 0.0
 
     print({
         "runs": args.runs,
@@ -308,17 +405,16 @@ def main():
         "uniq_avg": uniq_avg,
         "top10_share": top10,
         "top25_share": top25,
-        "uniq_p10": sorted(uniqs)[int(0.10*args.runs)],
-        "uniq_p50": sorted(uniqs)[int(0.50*args.runs)],
-        "uniq_p90": sorted(uniqs)[int(0.90*args.runs)],
+        "uniq_p10": uniq_p10,
+        "uniq_p50": uniq_p50,
+        "uniq_p90": uniq_p90,
     })
 
     # export trigger report
     with open("event_trigger_report.csv", "w", newline="", encoding="utf-8-sig") as f:
         w = csv.writer(f)
         w.writerow(["event_id","triggers"])
-        for eid, c in total_counts.most_common():
-            w.writerow([eid, c])
+        w.writerows((events[i]["id"], c) for i, c in zip(order.tolist(), ranked.tolist()) if c > 0)
 
 if __name__ == "__main__":
     main()